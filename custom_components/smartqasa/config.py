@@ -1,34 +1,61 @@
-import json
-import aiofiles
+import orjson
 import os
+from types import MappingProxyType
+from homeassistant.core import HomeAssistant
 
 from .const import (
     SQCONFIG_PATH,
     DEFAULT_CHANNEL,
     DEFAULT_AUTO_UPDATE,
 )
+from .helpers import read_file_if_modified, write_file_atomic
 
+# (st_mtime_ns, read-only parsed config) from the last read or write of
+# sqconfig.json; callers only ever receive dict copies of it.
+_cache: tuple[int, MappingProxyType] | None = None
 
-async def read_sqconfig() -> dict:
-    """Read SmartQasa sqconfig.json."""
 
-    if not os.path.exists(SQCONFIG_PATH):
+def _write_sqconfig_sync(data: bytes) -> int:
+    """Write sqconfig.json and return its new st_mtime_ns."""
+    write_file_atomic(SQCONFIG_PATH, data)
+    return os.stat(SQCONFIG_PATH).st_mtime_ns
+
+
+async def read_sqconfig(hass: HomeAssistant) -> dict:
+    """Read SmartQasa sqconfig.json, reparsing only when it has changed."""
+    global _cache
+
+    cached = _cache
+
+    try:
+        result = await hass.async_add_executor_job(
+            read_file_if_modified, SQCONFIG_PATH, cached[0] if cached else None
+        )
+    except OSError as e:
+        return {"error": f"Failed to read config: {e}"}
+
+    if result is None:
         return {
             "channel": DEFAULT_CHANNEL,
             "auto_update": DEFAULT_AUTO_UPDATE,
             "missing": True
         }
 
+    mtime_ns, content = result
+    if content is None:
+        return dict(cached[1])
+
     try:
-        async with aiofiles.open(SQCONFIG_PATH, "r", encoding="utf-8") as f:
-            content = await f.read()
-        return json.loads(content)
+        cfg = MappingProxyType(orjson.loads(content))
+        _cache = (mtime_ns, cfg)
+        return dict(cfg)
     except Exception as e:
         return {"error": f"Failed to read config: {e}"}
 
 
-async def write_sqconfig(channel: str, auto_update: bool) -> dict:
+async def write_sqconfig(hass: HomeAssistant, channel: str, auto_update: bool) -> dict:
     """Write SmartQasa sqconfig.json atomically."""
+    global _cache
 
     cfg = {
         "channel": channel,
@@ -36,12 +63,10 @@ async def write_sqconfig(channel: str, auto_update: bool) -> dict:
     }
 
     try:
-        tmp = SQCONFIG_PATH + ".tmp"
-
-        async with aiofiles.open(tmp, "w", encoding="utf-8") as f:
-            await f.write(json.dumps(cfg, indent=2))
-
-        os.replace(tmp, SQCONFIG_PATH)
+        mtime_ns = await hass.async_add_executor_job(
+            _write_sqconfig_sync, orjson.dumps(cfg, option=orjson.OPT_INDENT_2)
+        )
+        _cache = (mtime_ns, MappingProxyType(dict(cfg)))
 
         return {"success": True, "config": cfg}
 
@@ -1,28 +1,133 @@
+from contextlib import contextmanager, suppress
 from enum import Enum
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 import logging
+import os
+from typing import Any
 
 _LOGGER = logging.getLogger(__name__)
 
+# Workaround for outdated HA type hints:
+SupportsResponse = Any
+
+
+def _safe_seq(item):
+    # Sequences of scalars (color tuples, mode lists) need no per-element calls;
+    # always a new list so the scene cache never shares the entity's own list
+    if all(x.__class__ in _IMMUTABLE for x in item):
+        return list(item)
+    return [safe_item(x) for x in item]
+
+
+def _safe_dict(item):
+    # Flat {str: scalar} dicts (most attribute maps) need no per-value calls;
+    # still copied so the scene cache never shares the entity's own dict
+    if item.__class__ is dict and all(
+        k.__class__ is str and v.__class__ in _IMMUTABLE for k, v in item.items()
+    ):
+        return dict(item)
+    return {str(k): safe_item(v) for k, v in item.items()}
+
+
+# Scalars that are returned as-is without entering the handler lookup
+_IMMUTABLE = frozenset({str, int, float, bool, type(None), bytes})
+
+# Exact-type handlers for containers; subclasses (enums, read-only
+# dicts, ...) fall through to the isinstance checks below.
+_HANDLERS = {
+    list: _safe_seq,
+    tuple: _safe_seq,
+    set: _safe_seq,
+    dict: _safe_dict,
+}
+
 
 def safe_item(item):
     """Safe serialization for scenes."""
+    if item.__class__ in _IMMUTABLE:
+        return item
+
+    handler = _HANDLERS.get(type(item))
     try:
+        if handler is not None:
+            return handler(item)
         if isinstance(item, Enum):
             return item.value
+        # Scalar subclasses (e.g. zigpy uint8_t) that the safe dumper rejects
+        if isinstance(item, int):
+            return int(item)
+        if isinstance(item, float):
+            return float(item)
+        if isinstance(item, str):
+            return str(item)
         if isinstance(item, (list, tuple, set)):
-            return [safe_item(x) for x in item]
+            return _safe_seq(item)
         if isinstance(item, dict):
-            return {str(k): safe_item(v) for k, v in item.items()}
+            return _safe_dict(item)
         return item
     except Exception as e:
-        _LOGGER.warning(f"Failed to serialize item {item}: {e}")
+        _LOGGER.warning("Failed to serialize item %s: %s", item, e)
         return None
 
 
-async def retrieve_scene_id(hass: HomeAssistant, entity_id: str) -> str | None:
+@callback
+def retrieve_scene_id(hass: HomeAssistant, entity_id: str) -> str | None:
     """Get the internal scene ID field from a scene entity."""
     state = hass.states.get(entity_id)
     if not state:
         return None
     return state.attributes.get("id")
+
+
+def _fsync_dir(path: str):
+    """Flush a directory entry (e.g. after os.replace) to disk."""
+    fd = os.open(path, os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def read_file_if_modified(path: str, mtime_ns: int | None) -> tuple[int, bytes | None] | None:
+    """Read a file unless its st_mtime_ns equals mtime_ns (run in the executor).
+
+    Returns None if the file does not exist, otherwise (st_mtime_ns, content)
+    with content None when the file is unchanged.
+    """
+    try:
+        f = open(path, "rb")
+    except FileNotFoundError:
+        return None
+
+    with f:
+        current = os.fstat(f.fileno()).st_mtime_ns
+        if current == mtime_ns:
+            return current, None
+        return current, f.read()
+
+
+@contextmanager
+def atomic_write(path: str):
+    """Yield a binary temp file that atomically replaces path on success (run in the executor)."""
+    tmp = path + ".tmp"
+
+    try:
+        with open(tmp, "wb") as f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+
+        os.replace(tmp, path)
+    except BaseException:
+        # Don't leave a partial temp file behind when the write fails
+        with suppress(FileNotFoundError):
+            os.unlink(tmp)
+        raise
+
+    _fsync_dir(os.path.dirname(path))
+
+
+def write_file_atomic(path: str, data: bytes):
+    """Write data to path via an fsynced temp file and os.replace (run in the executor)."""
+    with atomic_write(path) as f:
+        f.write(data)
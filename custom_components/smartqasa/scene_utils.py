@@ -1,81 +1,196 @@
-import aiofiles
+from dataclasses import dataclass
 import os
-import tempfile
 import asyncio
-from ruamel.yaml import YAML
+import yaml
 from homeassistant.core import HomeAssistant
 import logging
 
-from .const import SCENES_FILE
-from .helpers import safe_item
+try:
+    from yaml import CSafeDumper as SafeDumper, CSafeLoader as SafeLoader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeDumper, SafeLoader
 
-yaml = YAML(typ="rt")
-yaml.allow_unicode = True
-yaml.default_flow_style = False
+from .const import SCENES_FILE
+from .helpers import atomic_write, safe_item
 
 _LOGGER = logging.getLogger(__name__)
 
-CAPTURE_LOCK = asyncio.Lock()
 
+class _SceneDumper(SafeDumper):
+    """Safe dumper that writes shared objects out in full instead of as aliases."""
 
-async def load_scenes_file(hass: HomeAssistant):
-    """Load scenes.yaml"""
-    path = os.path.join(hass.config.config_dir, SCENES_FILE)
+    def ignore_aliases(self, data):
+        return True
+
+
+# One writer lock per scenes.yaml path. Readers take no lock: writes
+# replace the file atomically, so a read sees either version in full.
+_WRITE_LOCKS: dict[str, asyncio.Lock] = {}
+
+
+@dataclass(slots=True)
+class _CachedScenes:
+    """Parsed scenes.yaml, its id index and the file stat it was read at."""
+
+    mtime_ns: int
+    size: int
+    scenes: list
+    index: dict
+
+
+# scene_update per scene ID that new callers may still join (pre-capture)
+_INFLIGHT: dict[str, asyncio.Task] = {}
+
+# Parsed scenes.yaml per path. Entries are shared with callers and never
+# mutated; update_scene_entities() installs a new entry after a successful
+# write.
+_SCENES_CACHE: dict[str, _CachedScenes] = {}
+
+
+def _index_scenes(scenes: list) -> dict:
+    """Map scene IDs to their position in scenes (first match wins)."""
+    index = {}
+    for i, scene in enumerate(scenes):
+        if isinstance(scene, dict) and "id" in scene:
+            index.setdefault(scene["id"], i)
+    return index
+
+
+def _load_scenes_sync(path: str, cached: _CachedScenes | None) -> _CachedScenes:
+    """Parse scenes.yaml unless cached matches its mtime and size (runs in the executor)."""
+    with open(path, "rb") as f:
+        st = os.fstat(f.fileno())
+        if cached and cached.mtime_ns == st.st_mtime_ns and cached.size == st.st_size:
+            return cached
 
-    async with aiofiles.open(path, "r", encoding="utf-8") as f:
-        content = await f.read()
+        # The loader pulls from the file handle in chunks
+        scenes = yaml.load(f, Loader=SafeLoader) or []
 
-    return yaml.load(content) or []
+    return _CachedScenes(st.st_mtime_ns, st.st_size, scenes, _index_scenes(scenes))
+
+
+def _write_lock(path: str) -> asyncio.Lock:
+    """Return the writer lock for a scenes.yaml path."""
+    lock = _WRITE_LOCKS.get(path)
+    if lock is None:
+        lock = _WRITE_LOCKS[path] = asyncio.Lock()
+    return lock
+
+
+def _write_scenes_sync(path: str, scenes: list) -> os.stat_result:
+    """Stream scenes as YAML into an atomic temp file (runs in the executor)."""
+    with atomic_write(path) as f:
+        yaml.dump(
+            scenes,
+            f,
+            Dumper=_SceneDumper,
+            encoding="utf-8",
+            default_flow_style=False,
+            allow_unicode=True,
+            sort_keys=False,
+        )
+    return os.stat(path)
+
+
+async def _load_scenes(hass: HomeAssistant, path: str) -> _CachedScenes:
+    """Return the cache entry for scenes.yaml, reparsing it if it changed."""
+    cached = _SCENES_CACHE.get(path)
+    entry = await hass.async_add_executor_job(_load_scenes_sync, path, cached)
+
+    # Don't overwrite an entry a writer installed while the job ran
+    if _SCENES_CACHE.get(path) is cached:
+        _SCENES_CACHE[path] = entry
+    return entry
 
 
 async def get_scene_entities(hass: HomeAssistant, scene_id: str):
     """Return entity list from a scene ID."""
-    scenes = await load_scenes_file(hass)
+    path = os.path.join(hass.config.config_dir, SCENES_FILE)
+    entry = await _load_scenes(hass, path)
 
-    for scene in scenes:
-        if scene.get("id") == scene_id:
-            return scene.get("entities", {})
+    index = entry.index.get(scene_id)
+    if index is None:
+        return None
+    return entry.scenes[index].get("entities", {})
 
-    return None
 
+def _release_inflight(scene_id: str, task: asyncio.Task | None):
+    """Stop sharing task with new callers, unless another task has replaced it."""
+    if _INFLIGHT.get(scene_id) is task:
+        del _INFLIGHT[scene_id]
 
-async def update_scene_entities(hass: HomeAssistant, scene_id: str):
-    """Update entities in scenes.yaml for given scene ID."""
 
-    async with CAPTURE_LOCK:
-        path = os.path.join(hass.config.config_dir, SCENES_FILE)
+async def update_scene_entities(hass: HomeAssistant, scene_id: str):
+    """Update entities in scenes.yaml for given scene ID.
+
+    A call for a scene whose update has not yet read the entity states
+    (it is still waiting for the write lock or loading scenes.yaml) awaits
+    that update instead of capturing and writing the scene a second time.
+    Once the capture starts, later calls run their own update, which
+    queues on the write lock, so no caller's states are dropped.
+    """
+    task = _INFLIGHT.get(scene_id)
+    # A finished task may linger until its done callback runs; don't reuse it
+    if task is None or task.done():
+        task = hass.async_create_task(_update_scene_entities(hass, scene_id))
+        _INFLIGHT[scene_id] = task
+        task.add_done_callback(lambda t: _release_inflight(scene_id, t))
+
+    # Shielded so a cancelled caller does not abort the shared update
+    return await asyncio.shield(task)
+
+
+async def _update_scene_entities(hass: HomeAssistant, scene_id: str):
+    """Capture current entity states into scenes.yaml for scene_id."""
+    path = os.path.join(hass.config.config_dir, SCENES_FILE)
 
-        scenes = await load_scenes_file(hass)
+    async with _write_lock(path):
+        entry = await _load_scenes(hass, path)
+        scenes = entry.scenes
 
-        # Find index
-        index = next((i for i, s in enumerate(scenes) if s.get("id") == scene_id), None)
+        index = entry.index.get(scene_id)
         if index is None:
             return {"success": False, "message": f"Scene {scene_id} not found"}
 
+        # States read from here on may predate later callers; stop sharing
+        _release_inflight(scene_id, asyncio.current_task())
+
+        # Edit copies so the cached entry stays untouched until the write succeeds
         scene = scenes[index]
-        entities = scene.get("entities", {}).copy()
+        entities = dict(scene.get("entities", {}))
+        changed = False
 
-        # Update entity attributes
         for ent_id in list(entities.keys()):
             state = hass.states.get(ent_id)
             if not state:
                 continue
 
-            attributes = dict(state.attributes)
+            attributes = {
+                k: safe_item(v) for k, v in state.attributes.items() if v is not None
+            }
             attributes["state"] = str(state.state)
-            attributes = {k: safe_item(v) for k, v in attributes.items() if v is not None}
-            entities[ent_id] = attributes
-
-        # Replace
-        scene["entities"] = entities
-        scenes[index] = scene
+            if entities[ent_id] != attributes:
+                entities[ent_id] = attributes
+                changed = True
+
+        # Nothing to persist when the captured states match the file
+        if not changed:
+            _LOGGER.debug("Scene %s unchanged, skipping write", scene_id)
+            return {
+                "success": True,
+                "unchanged": True,
+                "message": f"Scene {scene_id} unchanged",
+            }
+
+        scenes = list(scenes)
+        scenes[index] = {**scene, "entities": entities}
 
         # Write atomically
         try:
-            tmp = tempfile.NamedTemporaryFile("w", delete=False, dir=hass.config.config_dir)
-            yaml.dump(scenes, tmp)
-            tmp.close()
-            os.replace(tmp.name, path)
-            return {"success": True, "message": f"Scene {scene_id} updated"}
+            st = await hass.async_add_executor_job(_write_scenes_sync, path, scenes)
         except Exception as e:
             return {"success": False, "message": str(e)}
+
+        # Entity edits leave scene positions unchanged, so the index still holds
+        _SCENES_CACHE[path] = _CachedScenes(st.st_mtime_ns, st.st_size, scenes, entry.index)
+        return {"success": True, "message": f"Scene {scene_id} updated"}
@@ -1,5 +1,5 @@
 import voluptuous as vol
-from typing import Any, cast
+from typing import cast
 
 from homeassistant.core import HomeAssistant, ServiceCall
 import homeassistant.helpers.config_validation as cv
@@ -10,40 +10,37 @@ from .const import (
     SERVICE_CONFIG_WRITE,
 )
 from .config import read_sqconfig, write_sqconfig
+from .helpers import SupportsResponse
 
-# Workaround for outdated HA type hints:
-SupportsResponse = Any
+CONFIG_READ_SCHEMA = vol.Schema({})
+
+CONFIG_WRITE_SCHEMA = vol.Schema({
+    vol.Required("channel"): cv.string,
+    vol.Required("auto_update"): cv.boolean,
+})
 
 
 def register_config_services(hass: HomeAssistant):
     """Register config-related SmartQasa services."""
 
     async def handle_read(call: ServiceCall):
-        return await read_sqconfig()
+        return await read_sqconfig(hass)
 
     async def handle_write(call: ServiceCall):
         return await write_sqconfig(
+            hass,
             channel=call.data["channel"],
             auto_update=call.data["auto_update"],
         )
 
-    # READ SERVICE
-    hass.services.async_register(
-        DOMAIN,
-        SERVICE_CONFIG_READ,
-        handle_read,
-        schema=vol.Schema({}),
-        supports_response=cast(SupportsResponse, "only"),
-    )
-
-    # WRITE SERVICE
-    hass.services.async_register(
-        DOMAIN,
-        SERVICE_CONFIG_WRITE,
-        handle_write,
-        schema=vol.Schema({
-            vol.Required("channel"): cv.string,
-            vol.Required("auto_update"): cv.boolean,
-        }),
-        supports_response=cast(SupportsResponse, "only"),
-    )
+    for service, handler, schema in (
+        (SERVICE_CONFIG_READ, handle_read, CONFIG_READ_SCHEMA),
+        (SERVICE_CONFIG_WRITE, handle_write, CONFIG_WRITE_SCHEMA),
+    ):
+        hass.services.async_register(
+            DOMAIN,
+            service,
+            handler,
+            schema=schema,
+            supports_response=cast(SupportsResponse, "only"),
+        )
@@ -2,8 +2,7 @@ from homeassistant.core import HomeAssistant, ServiceCall, ServiceResponse
 import voluptuous as vol
 import homeassistant.helpers.config_validation as cv
 from typing import cast
-
-from custom_components.smartqasa.services_config import SupportsResponse
+import logging
 
 from .const import (
     DOMAIN,
@@ -15,7 +14,15 @@ from .scene_utils import (
     get_scene_entities,
     update_scene_entities,
 )
-from .helpers import retrieve_scene_id
+from .helpers import SupportsResponse, retrieve_scene_id
+
+_LOGGER = logging.getLogger(__name__)
+
+SCENE_ENTITY_SCHEMA = vol.Schema({
+    vol.Required("entity_id"): vol.All(cv.ensure_list, [cv.entity_id]),
+})
+
+SCENE_RELOAD_SCHEMA = vol.Schema({})
 
 
 def register_scene_services(hass: HomeAssistant):
@@ -23,7 +30,7 @@ def register_scene_services(hass: HomeAssistant):
 
     async def handle_get(call: ServiceCall) -> ServiceResponse:
         entity_id = call.data["entity_id"][0]
-        scene_id = await retrieve_scene_id(hass, entity_id)
+        scene_id = retrieve_scene_id(hass, entity_id)
 
         if scene_id is None:
             return {
@@ -39,7 +46,7 @@ def register_scene_services(hass: HomeAssistant):
 
     async def handle_update(call: ServiceCall) -> ServiceResponse:
         entity_id = call.data["entity_id"][0]
-        scene_id = await retrieve_scene_id(hass, entity_id)
+        scene_id = retrieve_scene_id(hass, entity_id)
 
         if scene_id is None:
             return {
@@ -50,32 +57,27 @@ def register_scene_services(hass: HomeAssistant):
         return await update_scene_entities(hass, scene_id)
 
     async def handle_reload(call: ServiceCall) -> ServiceResponse:
-        await hass.services.async_call("scene", "reload")
+        # Non-blocking: the scene platform reloads in the background
+        await hass.services.async_call("scene", "reload", blocking=False)
+        _LOGGER.debug("scene.reload scheduled")
         return {"success": True}
 
-    hass.services.async_register(
-        DOMAIN,
-        SERVICE_SCENE_GET,
-        handle_get,
-        schema=vol.Schema({
-            vol.Required("entity_id"): vol.All(cv.ensure_list, [cv.entity_id]),
-        }),
-        supports_response=cast(SupportsResponse, "only"),
-    )
-
-    hass.services.async_register(
-        DOMAIN,
-        SERVICE_SCENE_UPDATE,
-        handle_update,
-        schema=vol.Schema({
-            vol.Required("entity_id"): vol.All(cv.ensure_list, [cv.entity_id]),
-        }),
-        supports_response=cast(SupportsResponse, "only"),
-    )
+    # Response-only services; get and update share one entity schema
+    for service, handler, schema in (
+        (SERVICE_SCENE_GET, handle_get, SCENE_ENTITY_SCHEMA),
+        (SERVICE_SCENE_UPDATE, handle_update, SCENE_ENTITY_SCHEMA),
+    ):
+        hass.services.async_register(
+            DOMAIN,
+            service,
+            handler,
+            schema=schema,
+            supports_response=cast(SupportsResponse, "only"),
+        )
 
     hass.services.async_register(
         DOMAIN,
         SERVICE_SCENE_RELOAD,
         handle_reload,
-        schema=vol.Schema({}),
+        schema=SCENE_RELOAD_SCHEMA,
     )